@@ -3,45 +3,78 @@
 Example alert script that scans the SQLite database for new articles.
 In a production environment this could be extended to send emails or
 Slack notifications.
+
+The ID of the last alerted article is kept in the ``alert_state`` table
+of the same database, so reading new articles and advancing the cursor
+happen in one transaction.  Older versions kept it in ``alert_state.txt``;
+that file is read once to seed the table and then left alone.
 """
 
 import sqlite3
 from pathlib import Path
 
+import db
+
 DB_PATH = "data.db"
-STATE_PATH = Path("alert_state.txt")
+# State file used before the cursor moved into the database.
+LEGACY_STATE_PATH = Path("alert_state.txt")
+
+# Key of the alert cursor in the alert_state table.
+STATE_KEY = "last_id"
+
+SQL_CREATE_STATE = "CREATE TABLE IF NOT EXISTS alert_state (k TEXT PRIMARY KEY, v INTEGER)"
+SQL_GET_STATE = "SELECT v FROM alert_state WHERE k = ?"
+SQL_SET_STATE = "INSERT OR REPLACE INTO alert_state (k, v) VALUES (?, ?)"
+# Served by the idx_articles_id_title covering index created in step1_ingest.
+SQL_NEW_ARTICLES = "SELECT id, title FROM articles WHERE id > ? ORDER BY id"
 
 
-def get_last_alerted_id() -> int:
-    """Read the last alerted article ID from a state file."""
-    if STATE_PATH.exists():
+def read_legacy_state() -> int:
+    """Read the last alerted article ID from the legacy state file."""
+    if LEGACY_STATE_PATH.exists():
         try:
-            return int(STATE_PATH.read_text().strip())
+            return int(LEGACY_STATE_PATH.read_text().strip())
         except ValueError:
             return 0
     return 0
 
 
-def set_last_alerted_id(article_id: int) -> None:
-    STATE_PATH.write_text(str(article_id))
+def get_last_alerted_id(conn: sqlite3.Connection) -> int:
+    """Read the last alerted article ID from the alert_state table.
+
+    If the table has no cursor yet but the legacy state file exists, the
+    cursor is seeded from the file so the first run after upgrading does
+    not re-alert every article.  Call this inside the alert transaction.
+    """
+    row = conn.execute(SQL_GET_STATE, (STATE_KEY,)).fetchone()
+    if row:
+        return row[0]
+    if not LEGACY_STATE_PATH.exists():
+        return 0
+    last_id = read_legacy_state()
+    set_last_alerted_id(conn, last_id)
+    return last_id
+
+
+def set_last_alerted_id(conn: sqlite3.Connection, article_id: int) -> None:
+    conn.execute(SQL_SET_STATE, (STATE_KEY, article_id))
 
 
 def check_for_new_articles():
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    last_id = get_last_alerted_id()
-    rows = cursor.execute(
-        "SELECT id, title FROM articles WHERE id > ? ORDER BY id", (last_id,)
-    ).fetchall()
-    if rows:
-        for row in rows:
-            article_id, title = row
+    conn = db.writer(DB_PATH)
+    conn.execute(SQL_CREATE_STATE)
+    with db.transaction(conn):
+        last_id = get_last_alerted_id(conn)
+        # Iterate the cursor rather than fetching every new row at once.
+        # Rows are ordered by id, so article_id ends on the newest one.
+        article_id = last_id
+        for article_id, title in conn.execute(SQL_NEW_ARTICLES, (last_id,)):
             print(f"ALERT: New article ingested: {title} (ID {article_id})")
-            set_last_alerted_id(article_id)
-    else:
-        print("No new articles since last check.")
-    conn.close()
+        if article_id != last_id:
+            set_last_alerted_id(conn, article_id)
+        else:
+            print("No new articles since last check.")
 
 
 if __name__ == "__main__":
-    check_for_new_articles()
\ No newline at end of file
+    check_for_new_articles()
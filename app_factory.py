@@ -0,0 +1,247 @@
+"""
+FastAPI application factory for the Structured Notes Research API.
+
+``api.py``, ``index.py``, ``api/index.py`` and ``api_server.py`` all serve
+the same two endpoints and only differ in where they are mounted and how
+they are deployed.  They build their app with ``create_app`` from this
+module, so routes, the connection pool and response caching are defined
+in one place.
+
+Endpoints (relative to the app's ``prefix``):
+
+  GET /             – Return a page of articles, newest first.
+  GET /{article_id} – Return a single article by its numeric ID.
+
+Responses are serialised straight from the database rows with orjson.
+The pydantic ``Article`` model only describes the response schema in the
+generated OpenAPI docs.
+"""
+
+from __future__ import annotations
+
+import functools
+import sqlite3
+import time
+from typing import Iterable, Iterator
+
+import orjson
+import xxhash
+from fastapi import FastAPI, HTTPException, Path, Query, Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+import db
+
+# Path to the SQLite database, relative to the project root.
+DB_PATH = "data.db"
+
+
+class Article(BaseModel):
+    """Data model representing an article record."""
+
+    id: int
+    url: str
+    title: str
+    publication_date: str
+    fetched_at: str
+
+
+# Queries shared by every request.  Keeping them as constants means each
+# pooled connection prepares them once and then serves them from its
+# statement cache.
+SQL_LIST = (
+    "SELECT id, url, title, publication_date, fetched_at "
+    "FROM articles WHERE id < ? ORDER BY id DESC LIMIT ?"
+)
+SQL_GET = (
+    "SELECT id, url, title, publication_date, fetched_at "
+    "FROM articles WHERE id=?"
+)
+SQL_VERSION = "SELECT MAX(id), COUNT(*), MAX(fetched_at) FROM articles"
+
+# Page size limits for the list endpoint.
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Largest possible SQLite rowid, used as the cursor for the first page and
+# as the upper bound of id parameters, which SQLite cannot bind beyond it.
+MAX_ID = 2**63 - 1
+
+# Column order of SQL_LIST and SQL_GET, used as the JSON keys of each row
+# so responses are built without going through Pydantic.
+ARTICLE_FIELDS = ("id", "url", "title", "publication_date", "fetched_at")
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Rendered list pages are reused for this many seconds before SQLite is
+# queried again, and at most LIST_CACHE_SIZE of them are kept per app.
+LIST_CACHE_TTL = 10
+LIST_CACHE_SIZE = 64
+
+
+def list_etag(conn: sqlite3.Connection, ndjson: bool) -> str:
+    """Return a weak ETag that changes whenever the articles table does.
+
+    New rows raise ``MAX(id)``, deletions lower ``COUNT(*)`` and re-ingesting
+    an existing URL bumps ``MAX(fetched_at)``.  All three come from a single
+    pass over the table, which is far cheaper than building the response.
+    The JSON and NDJSON bodies of a URL get distinct tags, because caches
+    may hold both variants and revalidate them by tag.
+    """
+    max_id, count, last_fetched = conn.execute(SQL_VERSION).fetchone()
+    last_fetched = (last_fetched or "").replace(" ", "T")
+    suffix = "-ndjson" if ndjson else ""
+    return f'W/"{max_id or 0}-{count}-{last_fetched}{suffix}"'
+
+
+def content_etag(body: bytes) -> str:
+    """Return a strong ETag for ``body``.
+
+    xxh3 is a fast non-cryptographic hash, which is all an ETag needs.
+    """
+    return f'"{xxhash.xxh3_64_hexdigest(body)}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Return True if the request's ``If-None-Match`` header covers ``etag``.
+
+    ``If-None-Match`` uses weak comparison (RFC 9110, section 13.1.2), so
+    the ``W/`` prefix is ignored on both sides.  This also matches strong
+    tags that a proxy weakened, e.g. after re-compressing the body.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def iter_json_array(rows: Iterable[tuple]) -> Iterator[bytes]:
+    """Serialise rows as the chunks of a single JSON array."""
+    yield b"["
+    separator = b""
+    for row in rows:
+        yield separator + orjson.dumps(dict(zip(ARTICLE_FIELDS, row)))
+        separator = b","
+    yield b"]"
+
+
+def iter_ndjson(rows: Iterable[tuple]) -> Iterator[bytes]:
+    """Serialise rows as newline-delimited JSON, one article per line."""
+    for row in rows:
+        yield orjson.dumps(dict(zip(ARTICLE_FIELDS, row))) + b"\n"
+
+
+def create_app(
+    db_path: str = DB_PATH, prefix: str = "", version: str = "0.1", immutable: bool = False
+) -> FastAPI:
+    """Build the API application.
+
+    Args:
+        db_path: Path of the SQLite database to serve.
+        prefix: Path prefix for both endpoints, e.g. ``"/articles"``.
+        version: API version reported in the OpenAPI docs.
+        immutable: Open the database as immutable.  Only safe when nothing
+            writes to it while the app runs, as in the Vercel deployment.
+
+    Returns:
+        A ``FastAPI`` app with its own read-only connection pool and list
+        page cache.
+    """
+    # Read-only connections shared by all requests, up to one per CPU core,
+    # so concurrent requests do not queue on a single connection and
+    # SQLite's page cache and statement cache survive between calls.
+    pool = db.SqlitePool(db_path, immutable=immutable)
+
+    app = FastAPI(title="Structured Notes Research API", version=version)
+
+    @app.on_event("shutdown")
+    def close_db_pool() -> None:
+        """Close the pooled SQLite connections when the server stops."""
+        pool.close()
+
+    @functools.lru_cache(maxsize=LIST_CACHE_SIZE)
+    def current_etag(epoch: int, ndjson: bool) -> str:
+        """Return the list ETag for the current ``LIST_CACHE_TTL`` bucket.
+
+        Cached apart from ``render_page`` so a conditional request can be
+        answered without rendering, or even looking up, the page.
+        """
+        with pool.acquire() as conn:
+            return list_etag(conn, ndjson)
+
+    @functools.lru_cache(maxsize=LIST_CACHE_SIZE)
+    def render_page(epoch: int, cursor: int, limit: int, ndjson: bool) -> tuple[bytes, dict[str, str]]:
+        """Query and serialise one page of articles.
+
+        ``epoch`` is the current ``LIST_CACHE_TTL``-second time bucket.  It
+        is only part of the cache key, so a rendered page is reused until
+        the bucket rolls over.
+
+        Returns:
+            The response body and its ``ETag``/``X-Next-Cursor`` headers.
+        """
+        etag = current_etag(epoch, ndjson)
+        with pool.acquire() as conn:
+            rows = conn.execute(SQL_LIST, (cursor, limit)).fetchall()
+        encode = iter_ndjson if ndjson else iter_json_array
+        body = b"".join(encode(rows))
+        headers = {"ETag": etag, "Vary": "Accept"}
+        if len(rows) == limit:
+            headers["X-Next-Cursor"] = str(rows[-1][0])
+        return body, headers
+
+    @app.get(prefix or "/", response_model=list[Article])
+    def list_articles(
+        request: Request,
+        after_id: int | None = Query(None, ge=0, le=MAX_ID),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    ) -> Response:
+        """Return one page of stored articles, newest first.
+
+        The body is a JSON array, or newline-delimited JSON if the client
+        sends ``Accept: application/x-ndjson``.  Rendered pages are cached
+        in memory for ``LIST_CACHE_TTL`` seconds, so a newly ingested
+        article can take that long to appear.
+
+        Pages use keyset pagination on ``id``: pass the value of the
+        ``X-Next-Cursor`` response header as ``after_id`` to fetch the next
+        page.  The header is omitted on the last page.
+
+        Responses carry an ``ETag`` derived from the table's current state;
+        a request whose ``If-None-Match`` matches it gets an empty ``304``
+        before the page is rendered.
+        """
+        cursor = MAX_ID if after_id is None else after_id
+        ndjson = NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+        epoch = int(time.monotonic() // LIST_CACHE_TTL)
+        etag = current_etag(epoch, ndjson)
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag, "Vary": "Accept"})
+        body, headers = render_page(epoch, cursor, limit, ndjson)
+        media_type = NDJSON_MEDIA_TYPE if ndjson else "application/json"
+        return Response(body, media_type=media_type, headers=headers)
+
+    @app.get(prefix + "/{article_id}", response_model=Article)
+    def get_article(request: Request, article_id: int = Path(..., ge=0, le=MAX_ID)) -> Response:
+        """Return a single article by its numeric ID.
+
+        The row is serialised directly with orjson; ``Article`` only
+        documents the response schema.  The response carries an ``ETag``
+        hashed from the body, and a matching ``If-None-Match`` gets an
+        empty ``304``.
+
+        Raises:
+            HTTPException: If no article with the given ID exists.
+        """
+        with pool.acquire() as conn:
+            row = conn.execute(SQL_GET, (article_id,)).fetchone()
+        if not row:
+            raise HTTPException(status_code=404, detail="Article not found")
+        body = orjson.dumps(dict(zip(ARTICLE_FIELDS, row)))
+        headers = {"ETag": content_etag(body)}
+        if etag_matches(request, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    return app
@@ -6,38 +6,78 @@ Run with:
 
     streamlit run dashboard.py
 
-It will display a table of stored articles and a bar chart of publication dates.
+It will display a page of stored articles, newest first, and a bar chart
+of publication dates.  Older articles are reached by entering an ID to
+page back from.
 """
 
-import sqlite3
 import pandas as pd
 import streamlit as st
 
+import db
+
 DB_PATH = "data.db"
 
+# Number of articles shown in the table by default.
+TABLE_PAGE_SIZE = 100
+
+# Largest possible SQLite rowid, used as the cursor for the newest page.
+MAX_ID = 2**63 - 1
+
+SQL_TABLE = (
+    "SELECT id, url, title, publication_date, fetched_at "
+    "FROM articles WHERE id < ? ORDER BY id DESC LIMIT ?"
+)
+SQL_COUNTS = (
+    "SELECT date(publication_date) AS day, COUNT(*) AS articles "
+    "FROM articles WHERE day IS NOT NULL GROUP BY day ORDER BY day"
+)
+
+
+@st.cache_resource
+def get_pool() -> db.SqlitePool:
+    """Return the read-only connection pool shared by all sessions."""
+    return db.SqlitePool(DB_PATH)
+
 
 @st.cache_data
-def load_data():
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql_query(
-        "SELECT id, url, title, publication_date, fetched_at FROM articles",
-        conn,
-    )
-    conn.close()
+def load_table(limit: int, before_id: int = MAX_ID) -> pd.DataFrame:
+    """Return up to ``limit`` articles with an ID below ``before_id``, newest first.
+
+    Paging on ``id`` rather than an offset lets SQLite seek straight to
+    the page through the primary key.
+    """
+    with get_pool().acquire() as conn:
+        df = pd.read_sql_query(SQL_TABLE, conn, params=(before_id, limit))
+    return df
+
+
+@st.cache_data
+def load_counts() -> pd.DataFrame:
+    """Return the number of articles per publication day.
+
+    The grouping runs inside SQLite, so only one row per day is loaded.
+    """
+    with get_pool().acquire() as conn:
+        df = pd.read_sql_query(SQL_COUNTS, conn, index_col="day")
     return df
 
 
 def main():
     st.title("Structured Notes Research Dashboard")
-    df = load_data()
     st.subheader("Ingested Articles")
-    st.dataframe(df)
+    limit = st.number_input("Articles to show", min_value=1, max_value=1000, value=TABLE_PAGE_SIZE)
+    before_id = st.number_input(
+        "Older than ID (leave empty for the newest)", min_value=1, value=None, step=1
+    )
+    table = load_table(int(limit), MAX_ID if before_id is None else int(before_id))
+    st.dataframe(table)
+    if len(table) == limit:
+        st.caption(f"Enter {table['id'].iloc[-1]} above to see the next page.")
 
     st.subheader("Articles by Publication Date")
-    if not df.empty:
-        # Convert publication_date to datetime for plotting
-        df["publication_date"] = pd.to_datetime(df["publication_date"])
-        counts = df.groupby(df["publication_date"].dt.date).size()
+    counts = load_counts()
+    if not counts.empty:
         st.bar_chart(counts)
     else:
         st.info("No articles have been ingested yet.")
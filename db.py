@@ -0,0 +1,195 @@
+"""
+Shared SQLite connection helper.
+
+Every script in this project talks to the same ``data.db`` file, so the
+connection setup lives here rather than being repeated in each module.
+Connections are opened in autocommit mode (``isolation_level=None``) and
+tuned with a handful of PRAGMAs:
+
+* ``journal_mode=WAL`` lets readers (API, dashboard, alerts) run while the
+  ingest script is writing, and needs far fewer fsyncs than the default
+  rollback journal.  The journal mode is stored in the database file, so
+  it is only set on writable connections.
+* ``synchronous=NORMAL`` is safe under WAL and avoids an fsync per commit.
+* ``temp_store``, ``cache_size`` and ``mmap_size`` keep temporary data and
+  hot pages in memory.
+* ``busy_timeout`` makes a connection wait for a lock instead of failing
+  immediately with ``SQLITE_BUSY``.
+
+WAL allows many concurrent readers but only one writer, and the helpers
+below are arranged around that: ``SqlitePool`` hands out read-only
+connections to request handlers, while ``writer`` returns the single
+write connection of a process and ``transaction`` wraps writes in
+``BEGIN IMMEDIATE`` so the write lock is taken up front.  Writers call
+``close_writer`` when they are done so the WAL is folded back into the
+database file.
+"""
+
+from __future__ import annotations
+
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+# PRAGMAs applied to every connection.
+CONNECTION_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY;"
+    "PRAGMA cache_size=-64000;"
+    "PRAGMA busy_timeout=5000;"
+    "PRAGMA mmap_size=268435456;"
+)
+
+# PRAGMAs that modify the database and therefore need a writable connection.
+WRITE_PRAGMAS = "PRAGMA journal_mode=WAL;PRAGMA synchronous=NORMAL;"
+
+# PRAGMAs for immutable databases, which are never written while the
+# process runs (e.g. the read-only Vercel deployment), so the whole file
+# can be memory-mapped.
+IMMUTABLE_PRAGMAS = "PRAGMA query_only=1;PRAGMA mmap_size=1073741824;"
+
+# Size of each connection's prepared-statement cache.  Queries are kept in
+# module-level constants so repeated calls on a long-lived connection reuse
+# the compiled statement instead of parsing the SQL again.
+STATEMENT_CACHE_SIZE = 256
+
+
+def connect(
+    path: str, readonly: bool = False, immutable: bool = False, **kwargs
+) -> sqlite3.Connection:
+    """Open a tuned SQLite connection to ``path``.
+
+    Args:
+        path: Filesystem path of the SQLite database.
+        readonly: Open the database with ``mode=ro`` so the connection can
+            never write to it.
+        immutable: Also open it with ``immutable=1``, telling SQLite that
+            nothing else modifies the file, so it skips locking and WAL
+            checks.  Implies ``readonly``.
+        **kwargs: Extra keyword arguments passed to ``sqlite3.connect``.
+            ``cached_statements`` defaults to ``STATEMENT_CACHE_SIZE``.
+
+    Returns:
+        An autocommit ``sqlite3.Connection`` with the PRAGMAs applied.
+    """
+    if immutable:
+        uri = f"file:{path}?mode=ro&immutable=1"
+    elif readonly:
+        uri = f"file:{path}?mode=ro"
+    else:
+        uri = f"file:{path}"
+    kwargs.setdefault("cached_statements", STATEMENT_CACHE_SIZE)
+    conn = sqlite3.connect(uri, uri=True, isolation_level=None, **kwargs)
+    if immutable:
+        conn.executescript(CONNECTION_PRAGMAS + IMMUTABLE_PRAGMAS)
+    elif readonly:
+        conn.executescript(CONNECTION_PRAGMAS)
+    else:
+        conn.executescript(WRITE_PRAGMAS + CONNECTION_PRAGMAS)
+    return conn
+
+
+# Process-wide write connections, keyed by database path.
+_WRITERS: dict[str, sqlite3.Connection] = {}
+
+
+def writer(path: str) -> sqlite3.Connection:
+    """Return the process-wide write connection for ``path``.
+
+    The connection is opened on first use and reused afterwards, so all
+    writes from one process go through a single connection.
+    """
+    if path not in _WRITERS:
+        _WRITERS[path] = connect(path)
+    return _WRITERS[path]
+
+
+def close_writer(path: str) -> None:
+    """Checkpoint the WAL into the database file and close the writer.
+
+    Without this, rows written through ``writer`` may sit in the
+    ``-wal`` file, which is neither committed to the repository nor read
+    by immutable connections.  Does nothing if no writer is open.
+    """
+    conn = _WRITERS.pop(path, None)
+    if conn is None:
+        return
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.close()
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Run the enclosed statements in one ``BEGIN IMMEDIATE`` transaction.
+
+    The transaction is committed when the block exits normally and rolled
+    back if it raises.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+class SqlitePool:
+    """A bounded pool of read-only connections to a single database.
+
+    Connections are opened on first use rather than up front, so creating
+    a pool is cheap and a short-lived process only opens as many
+    connections as it has concurrent requests.
+
+    Args:
+        path: Filesystem path of the SQLite database.
+        size: Maximum number of connections to keep open.  Defaults to the
+            number of CPU cores.
+        **kwargs: Extra keyword arguments passed to ``connect``.
+    """
+
+    def __init__(self, path: str, size: int | None = None, **kwargs) -> None:
+        self._path = path
+        self._kwargs = kwargs
+        self._size = size or os.cpu_count() or 1
+        self._connections: queue.Queue[sqlite3.Connection] = queue.Queue(maxsize=self._size)
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _open(self) -> sqlite3.Connection | None:
+        """Open a new connection, or return None if the pool is full."""
+        with self._lock:
+            if self._opened >= self._size:
+                return None
+            self._opened += 1
+        try:
+            return connect(self._path, readonly=True, check_same_thread=False, **self._kwargs)
+        except BaseException:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    @contextmanager
+    def acquire(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection, blocking until one is free."""
+        try:
+            conn = self._connections.get_nowait()
+        except queue.Empty:
+            conn = self._open() or self._connections.get()
+        try:
+            yield conn
+        finally:
+            self._connections.put(conn)
+
+    def close(self) -> None:
+        """Close every connection currently held by the pool."""
+        while True:
+            try:
+                conn = self._connections.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
@@ -7,44 +7,72 @@ such as the article title and publication date.  It stores the results
 in a local SQLite database.  In a production system you would extend
 this script to loop over multiple sources, parse more detailed
 information (e.g., coupon rates, product types), and run on a schedule.
+
+Articles are fetched concurrently with ``httpx`` (install it with the
+``http2`` extra) and parsed with selectolax's Lexbor backend.
 """
 
+import asyncio
 import sqlite3
-import requests
-from bs4 import BeautifulSoup
+import httpx
+from selectolax.lexbor import LexborHTMLParser
 from datetime import datetime
+from typing import Iterable
+
+import db
 
-ARTICLE_URL = "https://www.caisgroup.com/articles/what-are-contingent-yield-notes"
+ARTICLE_URLS = [
+    "https://www.caisgroup.com/articles/what-are-contingent-yield-notes",
+]
 DB_PATH = "data.db"
 
+# Connection pool settings for fetching articles.  Idle connections
+# are kept alive so later requests to the same host skip the TCP and TLS
+# handshakes.
+HTTP_LIMITS = httpx.Limits(max_connections=32, max_keepalive_connections=16)
+HTTP_HEADERS = {"User-Agent": "structured-notes-bot/1"}
+HTTP_TIMEOUT = 30
+
+# Upsert used for every fetched article; kept as a constant so the write
+# connection prepares it once and reuses it for every row of a batch.
+SQL_INSERT = """
+    INSERT INTO articles (url, title, publication_date, fetched_at)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(url) DO UPDATE SET
+        title=excluded.title,
+        publication_date=excluded.publication_date,
+        fetched_at=excluded.fetched_at
+"""
 
-def fetch_article(url: str) -> tuple[str, str]:
+
+async def fetch_article(client: httpx.AsyncClient, url: str) -> tuple[str, str]:
     """Fetch an HTML page and return its title and publication date.
 
     Args:
+        client: HTTP client used to make the request.
         url: URL of the article to fetch.
 
     Returns:
         A tuple of (title, publication_date_str). If the date cannot be
         found, the current date is used instead.
     """
-    response = requests.get(url, timeout=30)
+    response = await client.get(url)
     response.raise_for_status()
-    soup = BeautifulSoup(response.text, "html.parser")
+    tree = LexborHTMLParser(response.text)
 
     # Extract the page's title
-    title_tag = soup.find("title")
-    title = title_tag.text.strip() if title_tag else url
+    title_tag = tree.css_first("title")
+    title = title_tag.text(strip=True) if title_tag else url
 
     # Attempt to find a publication date. CAIS articles often have a
     # date inside a tag with the attribute data-base-heading="Article".
+    # Many articles use a <time datetime="YYYY-MM-DD"> element, which the
+    # attribute selector finds inside the parser instead of a Python loop.
     date_str = None
-    for meta in soup.find_all("time"):
-        # Many articles use a <time datetime="YYYY-MM-DD"> element
-        datetime_attr = meta.get("datetime")
-        if datetime_attr and len(datetime_attr) >= 10:
-            date_str = datetime_attr[:10]
-            break
+    time_tag = tree.css_first("time[datetime]")
+    datetime_attr = time_tag.attributes.get("datetime") if time_tag else None
+    if datetime_attr and len(datetime_attr) >= 10:
+        date_str = datetime_attr[:10]
 
     # Fallback to current date if not found
     if not date_str:
@@ -53,11 +81,39 @@ def fetch_article(url: str) -> tuple[str, str]:
     return title, date_str
 
 
+async def fetch_articles(urls: Iterable[str]) -> list[tuple[str, str, str]]:
+    """Fetch several articles concurrently over a shared connection pool.
+
+    A URL that fails (HTTP error, timeout, ...) is reported and skipped,
+    so one bad page does not discard the articles that were fetched.
+
+    Returns:
+        ``(url, title, publication_date)`` tuples for the URLs that were
+        fetched, in the order of ``urls``.
+    """
+    urls = list(urls)
+    async with httpx.AsyncClient(
+        http2=True, limits=HTTP_LIMITS, headers=HTTP_HEADERS, timeout=HTTP_TIMEOUT
+    ) as client:
+        results = await asyncio.gather(
+            *(fetch_article(client, url) for url in urls), return_exceptions=True
+        )
+    records = []
+    for url, result in zip(urls, results):
+        if isinstance(result, Exception):
+            print(f"Failed to fetch {url}: {result!r}")
+            continue
+        if isinstance(result, BaseException):
+            raise result
+        title, pub_date = result
+        records.append((url, title, pub_date))
+    return records
+
+
 def init_db(db_path: str) -> sqlite3.Connection:
-    """Initialize the SQLite database and return a connection."""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    cursor.execute(
+    """Initialize the SQLite database and return its write connection."""
+    conn = db.writer(db_path)
+    conn.execute(
         """
         CREATE TABLE IF NOT EXISTS articles (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -68,33 +124,41 @@ def init_db(db_path: str) -> sqlite3.Connection:
         )
         """
     )
-    conn.commit()
+    # Lets alert.py read new (id, title) pairs from the index alone,
+    # without visiting the table rows.
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_articles_id_title ON articles(id, title)"
+    )
     return conn
 
 
-def save_article(conn: sqlite3.Connection, url: str, title: str, pub_date: str) -> None:
-    """Insert or update an article record in the database."""
-    cursor = conn.cursor()
+def save_articles(conn: sqlite3.Connection, records: Iterable[tuple[str, str, str]]) -> None:
+    """Insert or update a batch of article records in one transaction.
+
+    Args:
+        conn: Write connection returned by ``init_db``.
+        records: ``(url, title, publication_date)`` tuples.  All of them
+            are stamped with the same ``fetched_at`` time.
+    """
     fetched_at = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-    cursor.execute(
-        """
-        INSERT INTO articles (url, title, publication_date, fetched_at)
-        VALUES (?, ?, ?, ?)
-        ON CONFLICT(url) DO UPDATE SET
-            title=excluded.title,
-            publication_date=excluded.publication_date,
-            fetched_at=excluded.fetched_at
-        """,
-        (url, title, pub_date, fetched_at),
-    )
-    conn.commit()
+    with db.transaction(conn):
+        conn.executemany(
+            SQL_INSERT,
+            ((url, title, pub_date, fetched_at) for url, title, pub_date in records),
+        )
 
 
 def main() -> None:
     conn = init_db(DB_PATH)
-    title, pub_date = fetch_article(ARTICLE_URL)
-    save_article(conn, ARTICLE_URL, title, pub_date)
-    print(f"Fetched '{title}' published {pub_date} and stored in database.")
+    try:
+        records = asyncio.run(fetch_articles(ARTICLE_URLS))
+        for _, title, pub_date in records:
+            print(f"Fetched '{title}' published {pub_date}.")
+        save_articles(conn, records)
+        print(f"Stored {len(records)} article(s) in database.")
+    finally:
+        # data.db is deployed on its own, so fold the WAL back into it.
+        db.close_writer(DB_PATH)
 
 
 if __name__ == "__main__":